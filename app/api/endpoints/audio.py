@@ -4,8 +4,12 @@ from app.services.google_services import GoogleServiceManager
 from app.services.audio_processor import AudioProcessor
 from app.services.calendar_matcher import CalendarMatcher
 from app.services.summary_generator import SummaryGenerator
+from app.services.summary_writer import SummaryWriter
+from app.services.transcoder import transcoder
+from app.services.scratch_space import scratch_space
 from app.api.websocket import manager
 from app.core.config import get_settings
+from app.core.logging import set_log_context
 from typing import Dict, Any
 import asyncio
 import uuid
@@ -20,6 +24,8 @@ async def process_audio_files(
     request: ProcessingRequest
 ):
     """Process audio files with real-time status updates."""
+    summary_writer = None
+    set_log_context(job_id=client_id)
     try:
         # Initialize services
         async def status_callback(message: str, data: Dict[str, Any] = None):
@@ -29,6 +35,23 @@ async def process_audio_files(
         calendar_matcher = CalendarMatcher(google_service)
         summary_generator = SummaryGenerator(google_service)
 
+        async def upload_callback(file_name: str, file_id: str, success: bool):
+            if success:
+                await status_callback(
+                    f"Successfully processed {file_name}",
+                    {"file_id": file_id}
+                )
+            else:
+                await status_callback(
+                    f"Failed to upload summary for {file_name}"
+                )
+
+        summary_writer = SummaryWriter(
+            google_service,
+            request.summary_folder_id,
+            upload_callback
+        )
+
         # Validate folder access
         await status_callback("Validating folder access...")
         for folder_id in [request.audio_folder_id, request.summary_folder_id]:
@@ -46,28 +69,34 @@ async def process_audio_files(
         await status_callback("Fetching calendar events...")
         calendar_events = await calendar_matcher.fetch_calendar_events()
 
+        # Fetch existing summaries once
+        summarized_file_ids = await summary_writer.existing_file_ids()
+
         # Process each file
         for file in files:
             file_id = file['id']
             file_name = file['name']
+            set_log_context(file_id=file_id, stage="check")
 
             try:
                 # Check for existing summary
-                if await google_service.check_summary_exists(
-                    request.summary_folder_id, 
-                    file_id
-                ):
+                if file_id in summarized_file_ids:
                     await status_callback(
                         f"Skipping {file_name} - summary already exists"
                     )
                     continue
 
                 # Process audio file
-                transcript = await audio_processor.process_file(file_id, file_name)
+                transcript = await audio_processor.process_file(
+                    file_id,
+                    file_name,
+                    int(file['size']) if file.get('size') else None
+                )
                 if not transcript:
                     continue
 
                 # Match with calendar event
+                set_log_context(stage="match")
                 await status_callback(f"Matching {file_name} with calendar events...")
                 calendar_context = None
                 if calendar_events:
@@ -80,6 +109,7 @@ async def process_audio_files(
                         )
 
                 # Generate summary
+                set_log_context(stage="summarize")
                 await status_callback(f"Generating summary for {file_name}...")
                 summary = await summary_generator.generate_summary(
                     transcript,
@@ -87,36 +117,41 @@ async def process_audio_files(
                 )
 
                 if summary:
-                    # Upload summary
-                    await status_callback(f"Uploading summary for {file_name}...")
-                    success = await google_service.upload_summary(
-                        request.summary_folder_id,
-                        summary,
-                        file_name,
-                        file_id
-                    )
-                    if success:
-                        await status_callback(
-                            f"Successfully processed {file_name}",
-                            {"file_id": file_id}
-                        )
-                    else:
-                        await status_callback(
-                            f"Failed to upload summary for {file_name}"
-                        )
+                    # Queue summary for upload
+                    set_log_context(stage="upload")
+                    await status_callback(f"Queueing summary upload for {file_name}...")
+                    await summary_writer.add(summary, file_name, file_id)
 
             except Exception as e:
                 logger.error(f"Error processing {file_name}: {e}")
                 await status_callback(f"Error processing {file_name}: {str(e)}")
                 continue
 
+        await summary_writer.close()
         await status_callback("Processing completed")
 
     except Exception as e:
         logger.error(f"Processing error: {e}")
         await manager.send_error(client_id, str(e))
     finally:
-        manager.disconnect(client_id)
+        try:
+            if summary_writer is not None:
+                # The success path has already closed the writer, so this only
+                # matters after a failure or cancellation: it finishes uploads
+                # an interrupted flush left running and uploads anything buffered
+                await summary_writer.close()
+        except Exception as e:
+            logger.error(f"Error flushing summaries: {e}")
+        finally:
+            manager.disconnect(client_id)
+
+@router.get("/transcoder/metrics")
+async def transcoder_metrics() -> Dict[str, int]:
+    return transcoder.metrics()
+
+@router.get("/scratch/metrics")
+async def scratch_metrics() -> Dict[str, int]:
+    return scratch_space.metrics()
 
 @router.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
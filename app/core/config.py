@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Audio Processing API"
@@ -22,6 +22,42 @@ class Settings(BaseSettings):
     TEMP_DIR: str = "/tmp"
     MIN_SIMILARITY_THRESHOLD: float = 0.35
     TIME_WINDOW_DAYS: int = 365
+
+    # Transcoding Settings (None = derive from available CPUs)
+    TRANSCODE_MAX_WORKERS: Optional[int] = None
+    TRANSCODE_FFMPEG_THREADS: Optional[int] = None
+
+    # Scratch Space Settings (per-job directories live under TEMP_DIR)
+    # The quota is enforced per worker process; with N workers the scratch
+    # root can hold up to N * SCRATCH_QUOTA_BYTES, so size it accordingly.
+    SCRATCH_QUOTA_BYTES: int = 10 * 1024 ** 3
+    SCRATCH_RAM_DIR: Optional[str] = None  # e.g. /dev/shm
+    SCRATCH_RAM_MAX_FILE_BYTES: int = 32 * 1024 ** 2
+    SCRATCH_DEFAULT_FILE_BYTES: int = 100 * 1024 ** 2
+
+    # Summary Upload Settings
+    # A buffered summary is neither reported to the client nor safe from a
+    # container restart until it is flushed, so the interval bounds how much
+    # finished work can be lost. Files take minutes each, so short intervals
+    # mostly upload one summary at a time; raise it only to batch more.
+    SUMMARY_BATCH_SIZE: int = 5
+    SUMMARY_FLUSH_SECONDS: float = 60.0
+    SUMMARY_UPLOAD_CONCURRENCY: int = 5
+
+    # Startup Settings
+    WARMUP_ON_STARTUP: bool = False
+    IMPORT_TIME_BUDGET_SECONDS: float = 2.0
+
+    # Logging Settings (dict settings are read from JSON in the environment)
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = False
+    LOG_ENQUEUE: bool = False
+    LOG_CALLER_DEPTH: bool = False  # walk frames instead of trusting the stdlib record
+    LOG_LOGGER_LEVELS: Dict[str, str] = {
+        "googleapiclient": "WARNING",
+        "urllib3": "WARNING",
+    }
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
     
     class Config:
         env_file = ".env"
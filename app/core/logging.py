@@ -1,39 +1,166 @@
+import inspect
+import json
 import logging
+import random
 import sys
-from typing import Any
+import threading
+import traceback
+from contextvars import ContextVar
+from typing import Any, Dict
 from loguru import logger
 from loguru._defaults import LOGURU_FORMAT
+from loguru._recattrs import RecordFile
+from app.core.config import get_settings
+
+# Fields attached to every record logged from the current task
+CONTEXT_FIELDS = ("job_id", "file_id", "stage")
+
+_log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+
+def set_log_context(**fields: Any) -> None:
+    """Attach fields (job_id, file_id, stage) to records logged from the current task.
+
+    Each asyncio task runs in a copy of its parent's context, so fields set
+    inside a task do not leak back into the code that created it.
+    """
+    _log_context.set({**_log_context.get(), **fields})
+
+class Sampler:
+    """Keeps a configured fraction of records per logger name prefix.
+
+    Only records below WARNING are sampled; warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        self.rates = rates
+        self._cache: Dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        if name not in self._cache:
+            rate = 1.0
+            # Most specific configured prefix wins, as with stdlib logger levels
+            for prefix in sorted(self.rates, key=len, reverse=True):
+                if name == prefix or name.startswith(prefix + "."):
+                    rate = self.rates[prefix]
+                    break
+            self._cache[name] = rate
+        return self._cache[name]
+
+    def keep(self, name: str, levelno: int) -> bool:
+        if levelno >= logging.WARNING:
+            return True
+        rate = self.rate(name)
+        return rate >= 1.0 or random.random() < rate
 
 class InterceptHandler(logging.Handler):
+    def __init__(self, sampler: Sampler = None, walk_frames: bool = False):
+        super().__init__()
+        self.sampler = sampler
+        self.walk_frames = walk_frames
+        # Marks records as already sampled so the sink filter passes them through
+        self.logger = logger.bind(stdlib=True)
+        # Built once; takes the caller from the stdlib record being emitted
+        self.origin_logger = self.logger.patch(self._apply_origin)
+        self._local = threading.local()
+
+    def _apply_origin(self, r: Dict[str, Any]) -> None:
+        record = self._local.record
+        r.update(
+            name=record.name,
+            module=record.module,
+            file=RecordFile(record.filename, record.pathname),
+            function=record.funcName,
+            line=record.lineno
+        )
+
     def emit(self, record: logging.LogRecord) -> None:
+        if self.sampler and not self.sampler.keep(record.name, record.levelno):
+            return
+
         try:
             level = logger.level(record.levelname).name
         except ValueError:
             level = record.levelno
 
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
+        if not self.walk_frames:
+            # The stdlib record already knows where it came from; the patcher
+            # runs synchronously in this thread, so a thread-local can carry it
+            self._local.record = record
+            try:
+                self.origin_logger.opt(exception=record.exc_info).log(
+                    level, record.getMessage()
+                )
+            finally:
+                self._local.record = None
+            return
+
+        # Start from emit itself and skip it plus every logging-module frame
+        frame, depth = inspect.currentframe(), 0
+        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
             frame = frame.f_back
             depth += 1
 
-        logger.opt(depth=depth, exception=record.exc_info).log(
+        self.logger.opt(depth=depth, exception=record.exc_info).log(
             level, record.getMessage()
         )
 
+def _add_context(record: Dict[str, Any]) -> None:
+    context = _log_context.get()
+    if context:
+        record["extra"].update(context)
+
+def _json_format(record: Dict[str, Any]) -> str:
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    for field in CONTEXT_FIELDS:
+        if field in record["extra"]:
+            entry[field] = record["extra"][field]
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    record["extra"]["_json"] = json.dumps(entry, default=str)
+    return "{extra[_json]}\n"
+
 def setup_logging():
-    logging.root.handlers = [InterceptHandler()]
-    logging.root.setLevel(logging.INFO)
-    
-    for name in logging.root.manager.loggerDict.keys():
-        logging.getLogger(name).handlers = []
-        logging.getLogger(name).propagate = True
-    
+    settings = get_settings()
+    level = logging.getLevelName(settings.LOG_LEVEL.upper())
+    sampler = Sampler(settings.LOG_SAMPLE_RATES) if settings.LOG_SAMPLE_RATES else None
+
+    def sample_filter(record: Dict[str, Any]) -> bool:
+        return "stdlib" in record["extra"] or sampler.keep(
+            record["name"],
+            record["level"].no
+        )
+
     logger.configure(
         handlers=[
             {
                 "sink": sys.stdout,
-                "format": LOGURU_FORMAT,
-                "level": logging.INFO,
+                "format": _json_format if settings.LOG_JSON else LOGURU_FORMAT,
+                "level": level,
+                # Write from a background thread so the event loop never blocks on stdout
+                "enqueue": settings.LOG_ENQUEUE,
+                "filter": sample_filter if sampler else None,
             }
-        ]
-    )
\ No newline at end of file
+        ],
+        patcher=_add_context,
+    )
+
+    logging.root.handlers = [
+        InterceptHandler(sampler, walk_frames=settings.LOG_CALLER_DEPTH)
+    ]
+    logging.root.setLevel(level)
+
+    for name in logging.root.manager.loggerDict.keys():
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    # Noisy loggers are raised here so their records are dropped before
+    # they are ever built, let alone intercepted
+    for name, logger_level in settings.LOG_LOGGER_LEVELS.items():
+        logging.getLogger(name).setLevel(logger_level.upper())
@@ -1,16 +1,25 @@
 from app.services.google_services import GoogleServiceManager
+from app.services.transcoder import transcoder
+from app.services.scratch_space import scratch_space
 from app.core.config import get_settings
+from app.core.logging import set_log_context
 from loguru import logger
-from google.cloud import speech
 import asyncio
 import os
 import io
-import tempfile
 from typing import Optional, Callable
-import ffmpeg
 
 settings = get_settings()
 
+# 16-bit mono 48kHz WAV is 768 kbit/s: 12x a 64 kbit/s m4a and 24x a 32 kbit/s
+# opus voice memo. Reserve for the low-bitrate case so the quota is not overrun.
+WAV_EXPANSION_FACTOR = 24
+
+# Speech-to-Text long-running recognition accepts at most 480 minutes, which
+# bounds the WAV size no matter how large the compressed source is
+WAV_BYTES_PER_SECOND = 48000 * 2
+MAX_WAV_BYTES = 480 * 60 * WAV_BYTES_PER_SECOND
+
 class AudioProcessor:
     def __init__(
         self, 
@@ -19,38 +28,45 @@ class AudioProcessor:
     ):
         self.google_service = google_service
         self.status_callback = status_callback
-        self.temp_dir = tempfile.mkdtemp()
 
-    async def process_file(self, file_id: str, file_name: str) -> Optional[str]:
+    async def process_file(
+        self,
+        file_id: str,
+        file_name: str,
+        file_size: Optional[int] = None
+    ) -> Optional[str]:
         """Process a single audio file."""
-        local_path = os.path.join(self.temp_dir, file_name)
-        wav_path = f"{local_path}.wav"
+        source_size = file_size or settings.SCRATCH_DEFAULT_FILE_BYTES
+        wav_size = min(source_size * WAV_EXPANSION_FACTOR, MAX_WAV_BYTES)
 
         try:
-            await self.status_callback(f"Downloading {file_name}...")
-            await self._download_file(file_id, local_path)
+            # Scratch directory and files are removed on exit, including cancellation
+            async with scratch_space.job(file_id, source_size + wav_size) as job:
+                local_path = job.path(file_name, source_size)
+                wav_path = job.path(f"{file_name}.wav", wav_size)
+
+                set_log_context(stage="download")
+                await self.status_callback(f"Downloading {file_name}...")
+                await self._download_file(file_id, local_path)
 
-            await self.status_callback(f"Converting {file_name} to WAV format...")
-            await self._convert_to_wav(local_path, wav_path)
+                set_log_context(stage="convert")
+                await self.status_callback(f"Converting {file_name} to WAV format...")
+                await self._convert_to_wav(local_path, wav_path)
 
-            await self.status_callback(f"Transcribing {file_name}...")
-            transcript = await self._transcribe_audio(wav_path)
+                set_log_context(stage="transcribe")
+                await self.status_callback(f"Transcribing {file_name}...")
+                transcript = await self._transcribe_audio(wav_path)
 
-            return transcript
+                return transcript
 
         except Exception as e:
             logger.error(f"Error processing file {file_name}: {e}")
             await self.status_callback(f"Error processing {file_name}: {str(e)}")
             return None
 
-        finally:
-            # Cleanup temporary files
-            for path in [local_path, wav_path]:
-                if os.path.exists(path):
-                    os.remove(path)
-
     async def _download_file(self, file_id: str, local_path: str):
         """Download file from Google Drive."""
+        from googleapiclient.http import MediaIoBaseDownload
         request = self.google_service.drive_service.files().get_media(fileId=file_id)
         with open(local_path, 'wb') as f:
             downloader = MediaIoBaseDownload(f, request)
@@ -60,6 +76,7 @@ class AudioProcessor:
 
     async def _convert_to_wav(self, input_path: str, output_path: str):
         """Convert audio file to WAV format."""
+        import ffmpeg
         try:
             stream = ffmpeg.input(input_path)
             stream = ffmpeg.output(
@@ -69,15 +86,17 @@ class AudioProcessor:
                 ac=1,
                 ar=48000,
                 audio_bitrate='192k',
+                threads=transcoder.threads_per_job,
                 loglevel='warning'
             )
-            await asyncio.to_thread(ffmpeg.run, stream, capture_stdout=True, capture_stderr=True)
+            await transcoder.run(stream)
         except Exception as e:
             logger.error(f"FFmpeg conversion error: {e}")
             raise
 
     async def _transcribe_audio(self, audio_path: str) -> str:
         """Transcribe audio file using Google Speech-to-Text."""
+        from google.cloud import speech
         # Upload to GCS temporarily
         bucket = self.google_service.storage_client.bucket(settings.BUCKET_NAME)
         blob_name = f"temp_audio_{os.path.basename(audio_path)}"
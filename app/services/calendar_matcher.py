@@ -3,7 +3,6 @@ from app.core.config import get_settings
 from datetime import datetime, timedelta
 import pytz
 from typing import List, Dict, Any, Optional
-import numpy as np
 import requests
 from loguru import logger
 
@@ -118,6 +117,7 @@ class CalendarMatcher:
 
     def _calculate_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate similarity between two vectors."""
+        import numpy as np
         try:
             vec1 = np.array(vec1, dtype=np.float64)
             vec2 = np.array(vec2, dtype=np.float64)
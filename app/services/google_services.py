@@ -1,15 +1,46 @@
-from google.oauth2 import credentials
-from google.oauth2.credentials import Credentials
-from google.cloud import speech, storage
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, TYPE_CHECKING
 from loguru import logger
 from app.core.config import get_settings
+import asyncio
+import io
+import os
 import json
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_httplib2 import AuthorizedHttp
+
+# The Google SDKs are slow to import, so they are imported on first use
+# rather than when the API router is loaded.
+
 settings = get_settings()
 
+_discovery_documents: Dict[str, Dict[str, Any]] = {}
+
+def get_discovery_document(service: str, version: str) -> Dict[str, Any]:
+    """Return the bundled discovery document for a service, read and parsed only once."""
+    key = f"{service}.{version}"
+    if key not in _discovery_documents:
+        from googleapiclient.discovery_cache import get_static_doc
+        document = get_static_doc(service, version)
+        if document is None:
+            raise ValueError(f"No discovery document bundled for {key}")
+        _discovery_documents[key] = json.loads(document)
+    return _discovery_documents[key]
+
+def build_service(service: str, version: str, credentials: "Credentials"):
+    from googleapiclient.discovery import build_from_document
+    # build_from_document takes the parsed dict as-is; the parameter defaults
+    # it fills into method descriptions are the same on every build, so
+    # sharing one dict across builds is safe
+    return build_from_document(
+        get_discovery_document(service, version),
+        credentials=credentials
+    )
+
+# appProperties key tagging each summary document with its source audio file
+SUMMARY_SOURCE_PROPERTY = "sourceFileId"
+
 class GoogleServiceManager:
     def __init__(self, access_token: str):
         self.access_token = access_token
@@ -18,8 +49,9 @@ class GoogleServiceManager:
         self._speech_client = None
         self._storage_client = None
 
-    def _get_credentials(self) -> Credentials:
+    def _get_credentials(self) -> "Credentials":
         """Create credentials from access token."""
+        from google.oauth2.credentials import Credentials
         return Credentials(
             token=self.access_token,
             scopes=[
@@ -29,27 +61,35 @@ class GoogleServiceManager:
             ]
         )
 
+    def _authorized_http(self) -> "AuthorizedHttp":
+        """Create a fresh transport; httplib2 connections are not thread-safe."""
+        from google_auth_httplib2 import AuthorizedHttp
+        import httplib2
+        return AuthorizedHttp(self._get_credentials(), http=httplib2.Http())
+
     @property
     def drive_service(self):
         if not self._drive_service:
-            self._drive_service = build('drive', 'v3', credentials=self._get_credentials())
+            self._drive_service = build_service('drive', 'v3', self._get_credentials())
         return self._drive_service
 
     @property
     def calendar_service(self):
         if not self._calendar_service:
-            self._calendar_service = build('calendar', 'v3', credentials=self._get_credentials())
+            self._calendar_service = build_service('calendar', 'v3', self._get_credentials())
         return self._calendar_service
 
     @property
     def speech_client(self):
         if not self._speech_client:
+            from google.cloud import speech
             self._speech_client = speech.SpeechClient(credentials=self._get_credentials())
         return self._speech_client
 
     @property
     def storage_client(self):
         if not self._storage_client:
+            from google.cloud import storage
             self._storage_client = storage.Client(credentials=self._get_credentials())
         return self._storage_client
 
@@ -67,9 +107,65 @@ class GoogleServiceManager:
         try:
             results = self.drive_service.files().list(
                 q=f"'{folder_id}' in parents and trashed=false and mimeType contains 'audio/'",
-                fields="files(id, name, createdTime, modifiedTime, mimeType)"
+                fields="files(id, name, size, createdTime, modifiedTime, mimeType)"
             ).execute()
             return results.get('files', [])
         except Exception as e:
             logger.error(f"Error listing audio files: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def list_summarized_file_ids(self, folder_id: str) -> Set[str]:
+        """Return the source file IDs of every summary already in the folder."""
+        file_ids = set()
+        page_token = None
+        try:
+            while True:
+                results = self.drive_service.files().list(
+                    q=(
+                        f"'{folder_id}' in parents and trashed=false "
+                        "and mimeType='application/vnd.google-apps.document'"
+                    ),
+                    fields="nextPageToken, files(appProperties)",
+                    pageSize=1000,
+                    pageToken=page_token
+                ).execute()
+                for file in results.get('files', []):
+                    source_id = (file.get('appProperties') or {}).get(SUMMARY_SOURCE_PROPERTY)
+                    if source_id:
+                        file_ids.add(source_id)
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    return file_ids
+        except Exception as e:
+            logger.error(f"Error listing existing summaries: {e}")
+            raise
+
+    async def upload_summary(
+        self,
+        folder_id: str,
+        summary: str,
+        file_name: str,
+        file_id: str
+    ) -> bool:
+        """Create a Google Doc holding the summary, tagged with its source file."""
+        from googleapiclient.http import MediaIoBaseUpload
+        try:
+            request = self.drive_service.files().create(
+                body={
+                    'name': f"{os.path.splitext(file_name)[0]} - Summary",
+                    'mimeType': 'application/vnd.google-apps.document',
+                    'parents': [folder_id],
+                    'appProperties': {SUMMARY_SOURCE_PROPERTY: file_id},
+                },
+                media_body=MediaIoBaseUpload(
+                    io.BytesIO(summary.encode('utf-8')),
+                    mimetype='text/plain',
+                    resumable=False
+                ),
+                fields='id'
+            )
+            await asyncio.to_thread(request.execute, http=self._authorized_http())
+            return True
+        except Exception as e:
+            logger.error(f"Error uploading summary for {file_name}: {e}")
+            return False
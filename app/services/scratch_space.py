@@ -0,0 +1,174 @@
+from app.core.config import get_settings
+from contextlib import asynccontextmanager
+from loguru import logger
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import os
+import re
+import shutil
+import uuid
+
+settings = get_settings()
+
+class ScratchQuotaError(Exception):
+    pass
+
+class ScratchJob:
+    """Private scratch directory for a single job."""
+
+    def __init__(
+        self,
+        job_id: str,
+        disk_dir: str,
+        ram_dir: Optional[str] = None,
+        ram_max_file_bytes: int = 0
+    ):
+        self.job_id = job_id
+        self.disk_dir = disk_dir
+        self.ram_dir = ram_dir
+        self.ram_max_file_bytes = ram_max_file_bytes
+
+    def path(self, name: str, size_hint: Optional[int] = None) -> str:
+        """Local path for a file, on the RAM-backed directory when it is small enough."""
+        name = os.path.basename(name)
+        # "." and ".." would resolve to the job directory or the shared root
+        if name in ("", ".", ".."):
+            name = "file"
+        if (
+            self.ram_dir
+            and size_hint is not None
+            and size_hint <= self.ram_max_file_bytes
+        ):
+            os.makedirs(self.ram_dir, exist_ok=True)
+            return os.path.join(self.ram_dir, name)
+        return os.path.join(self.disk_dir, name)
+
+    def cleanup(self):
+        for directory in [self.disk_dir, self.ram_dir]:
+            if directory:
+                shutil.rmtree(directory, ignore_errors=True)
+
+class ScratchSpace:
+    """Per-job scratch directories under a common root with a byte quota.
+
+    Jobs reserve an estimate of the bytes they will write before they start;
+    when the quota is exhausted new jobs wait until running jobs release
+    theirs. The quota is tracked in memory and so applies per process; worker
+    processes sharing the root each get their own. Directories are named after
+    the owning process so that leftovers from crashed workers can be swept on
+    startup.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        quota_bytes: int,
+        ram_root: Optional[str] = None,
+        ram_max_file_bytes: int = 0
+    ):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.ram_root = ram_root
+        self.ram_max_file_bytes = ram_max_file_bytes
+        self.reserved_bytes = 0
+        self.active_jobs = 0
+        self.waiting_jobs = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "quota_bytes": self.quota_bytes,
+            "reserved_bytes": self.reserved_bytes,
+            "active_jobs": self.active_jobs,
+            "waiting_jobs": self.waiting_jobs,
+        }
+
+    @asynccontextmanager
+    async def job(self, job_id: str, reserve_bytes: int = 0) -> AsyncIterator[ScratchJob]:
+        """Reserve quota and yield a fresh scratch directory, removed on exit."""
+        if reserve_bytes > self.quota_bytes:
+            raise ScratchQuotaError(
+                f"Job {job_id} needs {reserve_bytes} bytes, "
+                f"more than the {self.quota_bytes} byte scratch quota"
+            )
+
+        await self._reserve(reserve_bytes)
+        try:
+            dir_name = f"{os.getpid()}_{uuid.uuid4().hex}_{re.sub(r'[^A-Za-z0-9_-]', '', job_id)}"
+            disk_dir = os.path.join(self.root, dir_name)
+            os.makedirs(disk_dir)
+            ram_dir = os.path.join(self.ram_root, dir_name) if self.ram_root else None
+            scratch_job = ScratchJob(job_id, disk_dir, ram_dir, self.ram_max_file_bytes)
+
+            self.active_jobs += 1
+            try:
+                yield scratch_job
+            finally:
+                self.active_jobs -= 1
+                scratch_job.cleanup()
+        finally:
+            await self._release(reserve_bytes)
+
+    async def _reserve(self, nbytes: int):
+        async with self.condition:
+            self.waiting_jobs += 1
+            try:
+                await self.condition.wait_for(
+                    lambda: self.reserved_bytes + nbytes <= self.quota_bytes
+                )
+            finally:
+                self.waiting_jobs -= 1
+            self.reserved_bytes += nbytes
+
+    async def _release(self, nbytes: int):
+        # Shielded so that a cancelled job still hands back its reservation
+        await asyncio.shield(self._do_release(nbytes))
+
+    async def _do_release(self, nbytes: int):
+        async with self.condition:
+            self.reserved_bytes -= nbytes
+            self.condition.notify_all()
+
+    def sweep_orphans(self) -> int:
+        """Remove scratch directories left behind by processes that are gone."""
+        removed = 0
+        for root in [self.root, self.ram_root]:
+            if not root or not os.path.isdir(root):
+                continue
+            for entry in os.scandir(root):
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                pid = entry.name.split("_", 1)[0]
+                if not pid.isdigit() or _process_alive(int(pid)):
+                    continue
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        if removed:
+            logger.info(f"Removed {removed} orphaned scratch directories")
+        return removed
+
+def _process_alive(pid: int) -> bool:
+    # Directories tagged with our own pid predate this process (pid reuse
+    # across container restarts), since sweeping happens before any job runs
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+scratch_space = ScratchSpace(
+    root=os.path.join(settings.TEMP_DIR, "audio-scratch"),
+    quota_bytes=settings.SCRATCH_QUOTA_BYTES,
+    ram_root=os.path.join(settings.SCRATCH_RAM_DIR, "audio-scratch") if settings.SCRATCH_RAM_DIR else None,
+    ram_max_file_bytes=settings.SCRATCH_RAM_MAX_FILE_BYTES,
+)
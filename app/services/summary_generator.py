@@ -1,12 +1,28 @@
 from app.services.google_services import GoogleServiceManager
 from app.core.config import get_settings
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 from loguru import logger
-import vertexai
-from vertexai.generative_models import GenerativeModel
+import asyncio
 
 settings = get_settings()
 
+MODEL_NAME = "gemini-1.5-flash-002"
+
+_model = None
+
+def get_model():
+    """Initialise Vertex AI and return the shared model, importing the SDK on first use."""
+    global _model
+    if _model is None:
+        import vertexai
+        from vertexai.generative_models import GenerativeModel
+        vertexai.init(
+            project=settings.PROJECT_ID,
+            location=settings.LOCATION
+        )
+        _model = GenerativeModel(MODEL_NAME)
+    return _model
+
 class SummaryGenerator:
     def __init__(self, google_service: GoogleServiceManager):
         self.google_service = google_service
@@ -15,11 +31,7 @@ class SummaryGenerator:
     @property
     def model(self):
         if self._model is None:
-            vertexai.init(
-                project=settings.PROJECT_ID,
-                location=settings.LOCATION
-            )
-            self._model = GenerativeModel("gemini-1.5-flash-002")
+            self._model = get_model()
         return self._model
 
     async def generate_summary(
@@ -0,0 +1,108 @@
+from app.services.google_services import GoogleServiceManager
+from app.core.config import get_settings
+from app.core.logging import set_log_context
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+from loguru import logger
+import asyncio
+
+settings = get_settings()
+
+class SummaryWriter:
+    """Buffers finished summaries and uploads them together.
+
+    A flush happens once ``batch_size`` summaries are waiting or
+    ``flush_interval`` seconds after the first one was buffered, whichever
+    comes first. Drive batch requests cannot carry media, so each summary is
+    still its own multipart create (with its appProperties set in the same
+    call), but a flush issues them concurrently instead of one at a time.
+    """
+
+    def __init__(
+        self,
+        google_service: GoogleServiceManager,
+        folder_id: str,
+        result_callback: Callable[[str, str, bool], Awaitable[None]],
+        batch_size: int = settings.SUMMARY_BATCH_SIZE,
+        flush_interval: float = settings.SUMMARY_FLUSH_SECONDS,
+        max_concurrency: int = settings.SUMMARY_UPLOAD_CONCURRENCY
+    ):
+        self.google_service = google_service
+        self.folder_id = folder_id
+        self.result_callback = result_callback
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_concurrency = max_concurrency
+        self._buffer: List[Tuple[str, str, str]] = []
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def existing_file_ids(self) -> Set[str]:
+        """Source file IDs that already have a summary in the folder."""
+        return await self.google_service.list_summarized_file_ids(self.folder_id)
+
+    async def add(self, summary: str, file_name: str, file_id: str):
+        self._buffer.append((summary, file_name, file_id))
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_interval())
+
+    async def _flush_after_interval(self):
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        # Nobody awaits this task, so failures must be logged here or they are lost
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing summaries: {e}")
+
+    async def flush(self):
+        """Upload everything currently buffered."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._flush_lock:
+            pending, self._buffer = self._buffer, []
+            if not pending:
+                return
+
+            # Shielded so that cancelling the caller, e.g. from
+            # ConnectionManager.disconnect, doesn't drop summaries that have
+            # already left the buffer; close() waits for them instead
+            inflight = asyncio.ensure_future(self._upload(pending))
+            self._inflight = inflight
+            try:
+                await asyncio.shield(inflight)
+            finally:
+                if inflight.done():
+                    self._inflight = None
+
+    async def _upload(self, pending: List[Tuple[str, str, str]]):
+        logger.info(f"Uploading {len(pending)} summaries")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def upload(summary: str, file_name: str, file_id: str):
+            # Runs in its own task under gather, so this stays local to it
+            set_log_context(file_id=file_id, stage="upload")
+            async with semaphore:
+                success = await self.google_service.upload_summary(
+                    self.folder_id,
+                    summary,
+                    file_name,
+                    file_id
+                )
+            await self.result_callback(file_name, file_id, success)
+
+        await asyncio.gather(*(upload(*entry) for entry in pending))
+
+    async def close(self):
+        """Finish uploads left running by a cancelled flush, then flush the rest."""
+        if self._inflight is not None:
+            inflight, self._inflight = self._inflight, None
+            try:
+                await inflight
+            except Exception as e:
+                logger.error(f"Error flushing summaries: {e}")
+        await self.flush()
@@ -0,0 +1,172 @@
+from app.core.config import get_settings
+from loguru import logger
+from typing import Dict, List, Optional
+import asyncio
+import math
+import os
+
+settings = get_settings()
+
+def available_cpus() -> int:
+    """Number of CPUs this process may actually use, honouring affinity and cgroup quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """Read the CPU quota from cgroup v2 or v1, if one is set."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+            if quota != "max":
+                return int(quota) / int(period)
+            return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+class TranscodeError(Exception):
+    pass
+
+class Transcoder:
+    """Runs ffmpeg jobs with concurrency bounded by the available CPUs.
+
+    Each job is an ffmpeg subprocess, so there is no Python work to farm out
+    to a process pool; instead the number of concurrent subprocesses is capped
+    and each one should be given ``threads_per_job`` as its ``threads`` output
+    option. Cancelling the awaiting task kills the subprocess rather than
+    leaving it orphaned.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, threads_per_job: Optional[int] = None):
+        self.cpus = available_cpus()
+        self.max_workers = max_workers or self.cpus
+        self.threads_per_job = threads_per_job or max(1, self.cpus // self.max_workers)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._processes: Dict[int, asyncio.subprocess.Process] = {}
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "cpus": self.cpus,
+            "max_workers": self.max_workers,
+            "threads_per_job": self.threads_per_job,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
+
+    async def run(self, stream) -> None:
+        """Run an ffmpeg-python output stream, waiting for a free slot first."""
+        args = stream.compile(overwrite_output=True)
+
+        self.queued += 1
+        try:
+            await self.semaphore.acquire()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            await self._execute(args)
+        finally:
+            self.running -= 1
+            self.semaphore.release()
+
+    async def _execute(self, args: List[str]) -> None:
+        spawn = asyncio.ensure_future(
+            asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        )
+        try:
+            process = await asyncio.shield(spawn)
+        except asyncio.CancelledError:
+            # The spawn carries on under the shield; kill the process once it exists
+            self.cancelled += 1
+            spawn.add_done_callback(self._kill_spawned)
+            raise
+        self._processes[process.pid] = process
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            await self._kill(process)
+            raise
+        finally:
+            self._processes.pop(process.pid, None)
+
+        if process.returncode != 0:
+            self.failed += 1
+            raise TranscodeError(
+                f"ffmpeg exited with code {process.returncode}: "
+                f"{stderr.decode(errors='replace').strip()}"
+            )
+        self.completed += 1
+
+    def _kill_spawned(self, spawn: asyncio.Future):
+        if spawn.cancelled() or spawn.exception() is not None:
+            return
+        process = spawn.result()
+        logger.warning(f"Killing ffmpeg process {process.pid}")
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+    async def _kill(self, process: asyncio.subprocess.Process):
+        if process.returncode is not None:
+            return
+        logger.warning(f"Killing ffmpeg process {process.pid}")
+        try:
+            process.kill()
+        except ProcessLookupError:
+            return
+        await process.wait()
+
+    async def shutdown(self):
+        """Kill any ffmpeg processes still running."""
+        for process in list(self._processes.values()):
+            await self._kill(process)
+
+transcoder = Transcoder(
+    max_workers=settings.TRANSCODE_MAX_WORKERS,
+    threads_per_job=settings.TRANSCODE_FFMPEG_THREADS,
+)
@@ -0,0 +1,37 @@
+from app.services.google_services import get_discovery_document
+from app.services.summary_generator import get_model
+from loguru import logger
+import asyncio
+import importlib
+import time
+
+# Modules that are otherwise imported on the first request
+HEAVY_MODULES = [
+    "google.oauth2.credentials",
+    "google_auth_httplib2",
+    "googleapiclient.discovery",
+    "googleapiclient.http",
+    "google.cloud.speech",
+    "google.cloud.storage",
+    "ffmpeg",
+    "numpy",
+]
+
+DISCOVERY_DOCUMENTS = [("drive", "v3"), ("calendar", "v3")]
+
+def _warm_up():
+    started = time.perf_counter()
+    for module in HEAVY_MODULES:
+        importlib.import_module(module)
+    # Parsed once here so per-job service builds skip json.loads entirely
+    for service, version in DISCOVERY_DOCUMENTS:
+        get_discovery_document(service, version)
+    get_model()
+    logger.info(f"Warm-up completed in {time.perf_counter() - started:.2f}s")
+
+async def warm_up():
+    """Import the heavy SDKs and build shared clients off the event loop."""
+    try:
+        await asyncio.to_thread(_warm_up)
+    except Exception as e:
+        logger.warning(f"Warm-up failed, clients will be built on first use: {e}")
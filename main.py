@@ -1,8 +1,17 @@
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import audio
 from app.core.config import get_settings
 from app.core.logging import setup_logging
+from loguru import logger
+from app.services.transcoder import transcoder
+from app.services.scratch_space import scratch_space
+from app.services.warmup import warm_up
 
 settings = get_settings()
 
@@ -32,12 +41,33 @@ app.include_router(
     tags=["audio"]
 )
 
+import_seconds = time.perf_counter() - _import_started
+
+warmup_task = None
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
-    pass
+    global warmup_task
+
+    if import_seconds > settings.IMPORT_TIME_BUDGET_SECONDS:
+        logger.warning(
+            f"Application import took {import_seconds:.2f}s, "
+            f"over the {settings.IMPORT_TIME_BUDGET_SECONDS:.2f}s budget"
+        )
+    else:
+        logger.info(f"Application import took {import_seconds:.2f}s")
+
+    scratch_space.sweep_orphans()
+
+    if settings.WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(warm_up())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    pass
\ No newline at end of file
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await transcoder.shutdown()
+    # Drain the enqueued log sink before the process exits
+    await logger.complete()
\ No newline at end of file